@@ -1,7 +1,9 @@
 import json
+import typing as t
 import urllib.parse
 
 import httpx
+import msgspec
 import structlog
 import tenacity
 
@@ -28,7 +30,8 @@ class BaseClient:
         json_: dict | None = None,
         data: dict | None = None,
         headers: dict | None = None,
-    ) -> dict:
+        type_: t.Any = None,
+    ) -> t.Any:
         if path.startswith("/"):
             logger.warning("Path will overwrite base path for request", path=path)
 
@@ -51,6 +54,28 @@ class BaseClient:
                 error=response.json(),
             )
 
+        if type_ is not None:
+            if not response.content:
+                # There was no return JSON to parse
+                return msgspec.json.decode(b"{}", type=type_)
+            try:
+                return msgspec.json.decode(response.content, type=type_)
+            except msgspec.ValidationError as e:
+                # raising here would be retried forever, so report it and let the
+                # caller see an empty response
+                logger.warning(
+                    "Response did not match the expected schema",
+                    response=response.status_code,
+                    error=str(e),
+                )
+            except msgspec.DecodeError as e:
+                logger.warning(
+                    "Unable to decode response",
+                    response=response.status_code,
+                    error=str(e),
+                )
+            return msgspec.json.decode(b"{}", type=type_)
+
         try:
             return response.json()
         except json.JSONDecodeError:
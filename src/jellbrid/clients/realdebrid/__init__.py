@@ -1,7 +1,7 @@
 from .bundle import RDBundle, RDBundleManager
 from .client import RealDebridClient
 from .downloader import RealDebridDownloader
-from .types import TorrentStatus
+from .types import FAILED_STATUSES, TorrentStatus
 
 __all__ = (
     "RealDebridClient",
@@ -9,4 +9,5 @@ __all__ = (
     "RDBundle",
     "RealDebridDownloader",
     "TorrentStatus",
+    "FAILED_STATUSES",
 )
@@ -1,14 +1,15 @@
+import functools
 import typing as t
 
-from jellbrid.clients.realdebrid.types import RDBundleFileFilter
+from jellbrid.clients.realdebrid.types import CachedTorrent, RDBundleFileFilter
 
 
 class RDBundleManager:
     def __init__(
         self,
-        data: list[dict[str, dict]] | dict,
+        data: list[dict[str, CachedTorrent]] | dict,
         *,
-        file_filters: list[RDBundleFileFilter] | None = None,
+        file_filters: t.Sequence[RDBundleFileFilter] | None = None,
     ):
         if isinstance(data, list):
             self.bundles = [RDBundle(d, file_filters=file_filters) for d in data]
@@ -27,6 +28,15 @@ class RDBundleManager:
                 return bundle
         return None
 
+    def get_bundles_gte_size(self, size: int):
+        """
+        Returns the first bundle with at least `size` files alongside the first
+        instantly available bundle regardless of file count, so the threshold
+        can be dropped without another lookup. The second bundle may have no
+        matching files
+        """
+        return self.get_bundle_gte_size(size), self.get_bundle_gte_size(0)
+
     def get_bundle_with_match(self):
         for bundle in self.bundles:
             if len(bundle.matches) > 0:
@@ -35,7 +45,10 @@ class RDBundleManager:
 
 class RDBundle:
     def __init__(
-        self, bundle: dict, *, file_filters: list[t.Callable[[str], bool]] | None = None
+        self,
+        bundle: dict[str, CachedTorrent],
+        *,
+        file_filters: t.Sequence[t.Callable[[str], bool]] | None = None,
     ):
         self.bundle = bundle
         file_filters = file_filters or []
@@ -47,36 +60,34 @@ class RDBundle:
 
     @property
     def matches(self):
-        return self._get_property_for_matches("file_id")
+        return self.file_ids
 
     @property
     def instant_availability(self):
-        return self.size == len(self.matches)
+        return self.size == len(self._matching_files)
 
     @property
     def file_ids(self):
-        return self._get_property_for_matches("file_id")
+        return [file_id for file_id, _ in self._matching_files]
 
     @property
     def filenames(self):
-        return self._get_property_for_matches("filename")
-
-    def _get_property_for_matches(
-        self, property: t.Literal["filename"] | t.Literal["file_id"]
-    ) -> list[str]:
+        return [filename for _, filename in self._matching_files]
+
+    @functools.cached_property
+    def _matching_files(self) -> list[tuple[str, str]]:
+        """
+        Runs every filter over the bundle's files in a single pass. The result is
+        shared by size, matches, file_ids and filenames
+        """
         files = []
         for file_id, file_data in self.bundle.items():
-            filename: str = file_data.get("filename", "").lower()
-
+            filename = file_data.filename.lower()
             for filter in self.file_filters:
                 if not filter(filename):
                     break
             else:
-                if property == "filename":
-                    files.append(filename)
-                if property == "file_id":
-                    files.append(file_id)
-
+                files.append((file_id, filename))
         return files
 
 
@@ -85,7 +96,7 @@ class TorrentBundle:
         self,
         pre_bundle: dict,
         *,
-        file_filters: list[t.Callable[[str], bool]] | None = None,
+        file_filters: t.Sequence[t.Callable[[str], bool]] | None = None,
     ):
         self.bundle = pre_bundle
         file_filters = file_filters or []
@@ -93,11 +104,11 @@ class TorrentBundle:
 
     @property
     def size(self):
-        return len(self.filenames)
+        return len(self._matching_files)
 
     @property
     def matches(self):
-        return self._get_property_for_matches("file_id")
+        return self.file_ids
 
     @property
     def instant_availability(self):
@@ -106,17 +117,19 @@ class TorrentBundle:
 
     @property
     def file_ids(self):
-        return self._get_property_for_matches("file_id")
+        return [file_id for file_id, _ in self._matching_files]
 
     @property
     def filenames(self):
-        return self._get_property_for_matches("filename")
-
-    def _get_property_for_matches(
-        self, property: t.Literal["filename"] | t.Literal["file_id"]
-    ) -> list[str]:
+        return [filename for _, filename in self._matching_files]
+
+    @functools.cached_property
+    def _matching_files(self) -> list[tuple[str, str]]:
+        """
+        Runs every filter over the torrent's files in a single pass. The result is
+        shared by size, matches, file_ids and filenames
+        """
         files = []
-
         for filedata in self.bundle["files"]:
             filename: str = filedata.get("path")
             file_id: str = filedata.get("id")
@@ -124,9 +137,5 @@ class TorrentBundle:
                 if not filter(filename):
                     break
             else:
-                if property == "filename":
-                    files.append(filename)
-                if property == "file_id":
-                    files.append(file_id)
-
+                files.append((file_id, filename))
         return files
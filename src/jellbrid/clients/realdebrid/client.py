@@ -8,9 +8,11 @@ from cachetools import TTLCache
 from jellbrid.clients.base import BaseClient
 from jellbrid.clients.realdebrid.bundle import RDBundleManager
 from jellbrid.clients.realdebrid.types import (
+    HashAvailability,
     InstantAvailablityType,
     MagnetAddedResponse,
     RDBundleFileFilter,
+    SelectFilesResponse,
     TorrentStatus,
 )
 from jellbrid.config import Config
@@ -63,7 +65,9 @@ class RealDebridClient:
         """
         hashes_ = [h.lower() for h in hashes]
         result = await self.client.request(
-            "GET", f"torrents/instantAvailability/{'/'.join(hashes_)}"
+            "GET",
+            f"torrents/instantAvailability/{'/'.join(hashes_)}",
+            type_=dict[str, HashAvailability | list] | list,
         )
         if isinstance(result, list):
             result = {}
@@ -77,38 +81,43 @@ class RealDebridClient:
 
         results = {}
         for key, data in candidates.items():
-            if data == []:
+            if isinstance(data, list):
                 continue
-            if data.get("rd", []) == []:
+            if data.rd == []:
                 continue
             results[key] = data
         return results
 
     async def instantly_available(self, hash: str) -> bool:
         result = await self.get_instant_availability_data([hash])
-        if result.get(hash, {}) == []:
+        data = result.get(hash)
+        if data is None or isinstance(data, list):
             return False
-        rd_data = result.get(hash, {}).get("rd", [])
-        return len(rd_data) > 0
+        return len(data.rd) > 0
 
     async def add_magnet(self, hash: str) -> MagnetAddedResponse:
         if not hash.startswith("magnet:?xt=urn:btih:"):
             magnet = f"magnet:?xt=urn:btih:{hash}"
 
-        result = await self.client.request(
-            "POST", "torrents/addMagnet", data={"magnet": magnet}
+        return await self.client.request(
+            "POST",
+            "torrents/addMagnet",
+            data={"magnet": magnet},
+            type_=MagnetAddedResponse,
         )
-        return t.cast(MagnetAddedResponse, result)
 
     async def delete_magnet(self, id: str):
         return await self.client.request("DELETE", f"torrents/delete/{id}")
 
-    async def select_files(self, torrent_id: str, files: t.Iterable[str]) -> dict:
+    async def select_files(
+        self, torrent_id: str, files: t.Iterable[str]
+    ) -> SelectFilesResponse:
         files = [str(f) for f in files]
         return await self.client.request(
             "POST",
             f"torrents/selectFiles/{torrent_id}",
             data={"files": ",".join(files)},
+            type_=SelectFilesResponse,
         )
 
     async def get_torrents(self, status: TorrentStatus | None = None):
@@ -133,9 +142,11 @@ class RealDebridClient:
     @asynccontextmanager
     async def tmp_torrent(self, hash: str):
         torrent = await self.add_magnet(hash)
-        torrent_id = torrent.get("id")
+        torrent_id = torrent.id
         if torrent_id is None:
-            logger.warning("Unable to add magnet", **torrent)
+            logger.warning(
+                "Unable to add magnet", error=torrent.error, code=torrent.error_code
+            )
             return
         try:
             yield torrent_id
@@ -147,7 +158,7 @@ class RealDebridClient:
         hash: str,
         count: int,
         *,
-        file_filters: list[RDBundleFileFilter] | None = None,
+        file_filters: t.Sequence[RDBundleFileFilter] | None = None,
     ):
         rdc = await self._get_bundle_manager(hash, file_filters)
         return rdc.get_bundle_of_size(count)
@@ -157,19 +168,22 @@ class RealDebridClient:
         hash: str,
         count: int,
         *,
-        file_filters: list[RDBundleFileFilter] | None = None,
+        file_filters: t.Sequence[RDBundleFileFilter] | None = None,
     ):
         rdc = await self._get_bundle_manager(hash, file_filters)
-        return rdc.get_bundle_gte_size(count)
+        return rdc.get_bundles_gte_size(count)
 
     async def get_rd_bundle_with_file_match(
-        self, hash: str, *, file_filters: list[RDBundleFileFilter] | None = None
+        self,
+        hash: str,
+        *,
+        file_filters: t.Sequence[RDBundleFileFilter] | None = None,
     ):
         rdc = await self._get_bundle_manager(hash, file_filters)
         return rdc.get_bundle_with_match()
 
     async def _get_bundle_manager(
-        self, hash: str, file_filters: list[RDBundleFileFilter] | None = None
+        self, hash: str, file_filters: t.Sequence[RDBundleFileFilter] | None = None
     ):
         data = await self.collect_data_from_uncached_torrent(hash)
         return RDBundleManager(data, file_filters=file_filters)
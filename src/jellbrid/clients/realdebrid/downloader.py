@@ -1,6 +1,9 @@
 import functools
+import itertools
 import typing as t
 
+import anyio
+import anyio.abc
 import structlog
 
 from jellbrid.clients.realdebrid.bundle import RDBundle, TorrentBundle
@@ -30,174 +33,350 @@ class RealDebridDownloader:
         request: SeasonRequest | EpisodeRequest | MovieRequest,
         streams: list[Stream],
         filters: list[RDBundleFileFilter] | None = None,
+        dev_short_circuit: bool | None = None,
     ):
         self.rdbc = rdbc
-        self.streams = streams
         self.request = request
 
+        # torrentio can list the same torrent from several trackers, so only keep
+        # the first (highest ranked) stream for each hash
+        seen: set[str] = set()
+        self.streams: list[Stream] = []
+        for stream in streams:
+            hash = stream["infoHash"].lower()
+            if hash not in seen:
+                seen.add(hash)
+                self.streams.append(stream)
+        if len(self.streams) < len(streams):
+            deduped_count = len(streams) - len(self.streams)
+            logger.debug("Removed duplicate streams", deduped_count=deduped_count)
+
+        if dev_short_circuit is None:
+            dev_short_circuit = rdbc.cfg.dev_short_circuit
+        self._dev_short_circuit = dev_short_circuit and rdbc.cfg.dev_mode
+
         self.filters = filters or []
         self.filters.extend((filter_samples, filter_extension))
+        self._filters_tuple = tuple(self.filters)
+        self._any_bundles: dict[str, RDBundle | TorrentBundle | None] = {}
+
+        if isinstance(request, EpisodeRequest):
+            self._episode_filter = functools.partial(
+                episode_filter,
+                season_id=request.season_id,
+                episode_id=request.episode_id,
+            )
+
+        # pick the download strategy once so that unsupported requests fail here
+        # rather than partway through a scan
+        dispatch: dict[type, t.Callable[[], t.Awaitable[str | None]]] = {
+            MovieRequest: self.download_movie,
+            SeasonRequest: self.download_show,
+            EpisodeRequest: self._download_episode_or_bundle,
+        }
+        if type(request) not in dispatch:
+            raise Exception("Can't download media for given request type")
+        self.download = dispatch[type(request)]
+
+    @functools.cached_property
+    def _movie_filter(self) -> RDBundleFileFilter:
+        return functools.partial(movie_name_filter, name=self.request.title)
 
-    def _filter_full_season_named_streams(self, streams: list[Stream]) -> list[Stream]:
-        results = []
+    def _filter_full_season_named_streams(
+        self, streams: t.Iterable[Stream]
+    ) -> t.Iterator[Stream]:
         for stream in streams:
             if name_contains_full_season(stream, t.cast(SeasonRequest, self.request)):
-                results.append(stream)
-        return results
+                yield stream
 
-    def _filter_streams_with_release_year(self, streams: list[Stream]) -> list[Stream]:
-        results = []
+    def _filter_streams_with_release_year(
+        self, streams: t.Iterable[Stream]
+    ) -> t.Iterator[Stream]:
         for stream in streams:
             if name_contains_release_year(stream, t.cast(MovieRequest, self.request)):
-                results.append(stream)
-        return results
+                yield stream
 
     async def _find_bundle_with_file_count(
         self, stream: Stream, count: int, *, filter: RDBundleFileFilter | None = None
     ):
-        ffs = self.filters + [filter] if filter else self.filters
+        ffs = (*self._filters_tuple, filter) if filter else self._filters_tuple
         cache = await self.rdbc.get_rd_bundle_with_file_count(
             stream["infoHash"], count, file_filters=ffs
         )
         return cache
 
     async def _find_bundle_with_file(self, stream: Stream):
-        if not isinstance(self.request, EpisodeRequest):
-            raise Exception("Attempt to use episode filter on an unsupported Request")
-        e_filter = functools.partial(
-            episode_filter,
-            season_id=self.request.season_id,
-            episode_id=self.request.episode_id,
-        )
-        ffs = self.filters + [e_filter]
+        ffs = (*self._filters_tuple, self._episode_filter)
         cache = await self.rdbc.get_rd_bundle_with_file_match(
             stream["infoHash"], file_filters=ffs
         )
         return cache
 
     async def _find_bundle_with_file_ratio(self, stream: Stream, ratio: float):
-        if not isinstance(self.request, SeasonRequest):
-            raise Exception("Attempt to use ratio filter on an unsupported Request")
-
-        count = int(len(self.request.episodes) * ratio)
-        bundle = await self.rdbc.get_rd_bundle_with_file_count_gte(
-            stream["infoHash"], count, file_filters=self.filters
+        request = t.cast(SeasonRequest, self.request)
+        count = int(len(request.episodes) * ratio)
+        bundle, any_bundle = await self.rdbc.get_rd_bundle_with_file_count_gte(
+            stream["infoHash"], count, file_filters=self._filters_tuple
         )
+        self._any_bundles[stream["infoHash"]] = any_bundle
         return bundle
 
+    async def _race_bundles(
+        self,
+        streams: t.Iterator[Stream],
+        probe: t.Callable[[Stream], t.Awaitable[RDBundle | TorrentBundle | None]],
+        limit: int,
+    ) -> tuple[Stream, RDBundle | TorrentBundle, list[Stream]] | None:
+        """
+        Probes up to `limit` streams concurrently, pulling from `streams` only as
+        probe slots free up. Returns the highest ranked stream with a match, its
+        bundle and any streams pulled after it. Remaining probes are cancelled as
+        soon as every higher ranked stream is known to have missed.
+        """
+        pulled: list[Stream] = []
+        results: list[RDBundle | TorrentBundle | None] = []
+        done: list[bool] = []
+        cursor = 0
+        winner: int | None = None
+        semaphore = anyio.Semaphore(limit)
+
+        async def worker(i: int, stream: Stream, tg: anyio.abc.TaskGroup):
+            nonlocal cursor, winner
+            try:
+                # each task runs in its own copy of the context, so this binding
+                # is task-local and never needs restoring
+                structlog.contextvars.bind_contextvars(hash=stream["infoHash"])
+                results[i] = await probe(stream)
+                done[i] = True
+            finally:
+                semaphore.release()
+
+            while cursor < len(pulled) and done[cursor]:
+                if results[cursor] is not None:
+                    winner = cursor
+                    tg.cancel_scope.cancel()
+                    return
+                cursor += 1
+
+        async with anyio.create_task_group() as tg:
+            while True:
+                # acquire before pulling so a cancellation never drops a stream
+                await semaphore.acquire()
+                stream = next(streams, None)
+                if stream is None:
+                    semaphore.release()
+                    break
+                pulled.append(stream)
+                results.append(None)
+                done.append(False)
+                tg.start_soon(worker, len(pulled) - 1, stream, tg)
+
+        if winner is None:
+            return None
+        bundle = t.cast(RDBundle | TorrentBundle, results[winner])
+        return pulled[winner], bundle, pulled[winner + 1 :]
+
+    async def _download_first(
+        self,
+        streams: t.Iterable[Stream],
+        probe: t.Callable[[Stream], t.Awaitable[RDBundle | TorrentBundle | None]],
+    ) -> str | None:
+        """
+        Downloads the highest ranked stream with a matching bundle, falling back to
+        lower ranked streams if a download cannot be started
+        """
+        logger.debug("Searching for a bundle", rdbc_cache_size=self.rdbc.cache.currsize)
+        remaining = iter(streams)
+        while True:
+            found = await self._race_bundles(
+                remaining, probe, self.rdbc.cfg.n_parallel_probes
+            )
+            if found is None:
+                return None
+
+            stream, bundle, pending = found
+            downloaded = await self._download(stream, bundle)
+            if downloaded is not None:
+                return downloaded
+            remaining = itertools.chain(pending, remaining)
+
+    def _skip_in_dev_mode(self) -> bool:
+        if self._dev_short_circuit:
+            logger.info("Skipped searching for a download")
+        return self._dev_short_circuit
+
     async def download_movie(self) -> str | None:
-        streams = self.streams
+        if self._skip_in_dev_mode():
+            return "dev"
+
+        streams: t.Iterable[Stream] = self.streams
         # try to get better results on movies with ambiguous titles
         if len(self.request.title) < 6:
             streams = self._filter_streams_with_release_year(streams)
 
-        movie_filter = functools.partial(movie_name_filter, name=self.request.title)
-
-        for stream in streams:
-            hash = stream["infoHash"]
-            with structlog.contextvars.bound_contextvars(
-                hash=hash, rdbc_cache_size=self.rdbc.cache.currsize
-            ):
-                bundle = await self._find_bundle_with_file_count(
-                    stream, 1, filter=movie_filter
-                )
-                if bundle is None:
-                    continue
-                downloaded = await self._download(stream, bundle)
-                if downloaded is not None:
-                    return downloaded
-        return None
+        probe = functools.partial(
+            self._find_bundle_with_file_count, count=1, filter=self._movie_filter
+        )
+        return await self._download_first(streams, probe)
 
     async def download_show(self) -> str | None:
+        if self._skip_in_dev_mode():
+            return "dev"
+
         # this is probably unecessary for cached streams, but necessary for
         # uncached
         streams = self.streams
+
+        # try to find a bundle with at least 80% of the files we want. candidates
+        # are filtered lazily so an early match skips filtering the tail
         candidates = self._filter_full_season_named_streams(streams)
+        probe = functools.partial(self._find_bundle_with_file_ratio, ratio=0.8)
+        downloaded = await self._download_first(candidates, probe)
+        if downloaded is not None:
+            return downloaded
 
-        # try to find a bundle with at least 80% of the files we want
-        for stream in candidates:
-            hash = stream["infoHash"]
-            with structlog.contextvars.bound_contextvars(
-                hash=hash, rdbc_cache_size=self.rdbc.cache.currsize
-            ):
-                bundle = await self._find_bundle_with_file_ratio(stream, 0.8)
-                if bundle is None:
-                    continue
-                downloaded = await self._download(stream, bundle)
-                if downloaded is not None:
-                    return downloaded
-
-        # try to find a bundle with any amount of files
-        for stream in candidates:
-            with structlog.contextvars.bound_contextvars(hash=stream["infoHash"]):
-                bundle = await self._find_bundle_with_file_ratio(stream, 0)
-                if bundle is None:
-                    continue
-                downloaded = await self._download(stream, bundle)
-                if downloaded is not None:
-                    return downloaded
-        return None
+        # try to find a bundle with any amount of files. the first pass already
+        # looked these up, so reuse its results instead of probing RD again
+        fallbacks = [
+            (stream, bundle)
+            for stream in self._filter_full_season_named_streams(streams)
+            if (bundle := self._any_bundles.get(stream["infoHash"])) is not None
+        ]
+        return await self._download_batch(fallbacks)
 
     async def download_episode(self) -> str | None:
-        if isinstance(self.request, (MovieRequest, SeasonRequest)):
-            raise Exception("Can't download episode for given request type")
+        if self._skip_in_dev_mode():
+            return "dev"
 
-        e_filter = functools.partial(
-            episode_filter,
-            season_id=self.request.season_id,
-            episode_id=self.request.episode_id,
-        )
         # look for a single file that's instantly available
-        for stream in self.streams:
-            hash = stream["infoHash"]
-            with structlog.contextvars.bound_contextvars(
-                hash=hash, rdbc_cache_size=self.rdbc.cache.currsize
-            ):
-                bundle = await self._find_bundle_with_file_count(
-                    stream, 1, filter=e_filter
-                )
-                if bundle is None:
-                    continue
-
-                downloaded = await self._download(stream, bundle)
-                if downloaded is not None:
-                    return downloaded
-        return None
+        probe = functools.partial(
+            self._find_bundle_with_file_count, count=1, filter=self._episode_filter
+        )
+        return await self._download_first(self.streams, probe)
+
+    async def _download_episode_or_bundle(self) -> str | None:
+        # search for a cached file with just the episode we want
+        downloaded = await self.download_episode()
+        if downloaded is None:
+            # search for the episode we want inside of a cached file
+            downloaded = await self.download_episode_from_bundle()
+        return downloaded
 
     async def download_episode_from_bundle(self) -> str | None:
-        for stream in self.streams:
-            hash = stream["infoHash"]
-            with structlog.contextvars.bound_contextvars(hash=hash):
-                bundle = await self._find_bundle_with_file(stream)
-                if bundle is None:
-                    continue
-
-                downloaded = await self._download(stream, bundle)
-                if downloaded is not None:
-                    return downloaded
-        return None
+        if self._skip_in_dev_mode():
+            return "dev"
+
+        return await self._download_first(self.streams, self._find_bundle_with_file)
 
     async def _download(
         self, stream: Stream, bundle: RDBundle | TorrentBundle
     ) -> str | None:
+        hash = stream["infoHash"]
         if self.rdbc.cfg.dev_mode:
             logger.info(
                 "Skipped downloading file",
+                hash=hash,
                 bundle=bundle.bundle if bundle else bundle,
             )
             return ""
 
-        torrent = await self.rdbc.add_magnet(stream["infoHash"])
-        torrent_id = torrent.get("id")
+        torrent = await self.rdbc.add_magnet(hash)
+        torrent_id = torrent.id
         if torrent_id is None:
-            logger.warning("Unable to add magnet", **torrent)
+            logger.warning(
+                "Unable to add magnet",
+                hash=hash,
+                error=torrent.error,
+                code=torrent.error_code,
+            )
             return None
 
-        result = await self.rdbc.select_files(torrent["id"], bundle.file_ids)
-        if "error" in result:
-            logger.warning("Unable to start torrent", **result)
-            result = await self.rdbc.delete_magnet(torrent_id)
+        if not await self._start_torrent(hash, torrent_id, bundle):
             return None
 
-        logger.info("Downloaded torrent")
-        return torrent["id"]
+        logger.info("Downloaded torrent", hash=hash)
+        return torrent_id
+
+    async def _download_batch(
+        self,
+        streams_and_bundles: list[tuple[Stream, RDBundle | TorrentBundle]],
+        parallelism: int = 3,
+    ) -> str | None:
+        """
+        Downloads the highest ranked candidate RD will start. Candidates are added
+        one at a time until one fails to start, then `parallelism` at a time so
+        the add round trips for the next candidates overlap. Added magnets are
+        started in rank order and the rest are deleted once one starts. Each
+        magnet is added at most once, and any added magnet that isn't started is
+        deleted, even on error
+        """
+        # there's nothing to select on a bundle without files
+        streams_and_bundles = [
+            (stream, bundle)
+            for stream, bundle in streams_and_bundles
+            if bundle.file_ids
+        ]
+        if self.rdbc.cfg.dev_mode and streams_and_bundles:
+            return await self._download(*streams_and_bundles[0])
+
+        start = 0
+        size = 1
+        while start < len(streams_and_bundles):
+            batch = streams_and_bundles[start : start + size]
+            start += len(batch)
+            size = parallelism
+            # ids RD accepted that still need to be started or cleaned up, by
+            # rank within the batch
+            added: dict[int, str] = {}
+
+            async def add(i: int, stream: Stream):
+                torrent = await self.rdbc.add_magnet(stream["infoHash"])
+                if torrent.id is None:
+                    logger.warning(
+                        "Unable to add magnet",
+                        hash=stream["infoHash"],
+                        error=torrent.error,
+                        code=torrent.error_code,
+                    )
+                    return
+                added[i] = torrent.id
+
+            try:
+                async with anyio.create_task_group() as tg:
+                    for i, (stream, _) in enumerate(batch):
+                        tg.start_soon(add, i, stream)
+
+                for i in sorted(added):
+                    stream, bundle = batch[i]
+                    # _start_torrent deletes the torrent itself when it fails
+                    torrent_id = added.pop(i)
+                    if await self._start_torrent(
+                        stream["infoHash"], torrent_id, bundle
+                    ):
+                        logger.info("Downloaded torrent", hash=stream["infoHash"])
+                        return torrent_id
+            finally:
+                if added:
+                    with anyio.CancelScope(shield=True):
+                        await self._delete_magnets(list(added.values()))
+        return None
+
+    async def _delete_magnets(self, torrent_ids: list[str]):
+        async with anyio.create_task_group() as tg:
+            for torrent_id in torrent_ids:
+                tg.start_soon(self.rdbc.delete_magnet, torrent_id)
+
+    async def _start_torrent(
+        self, hash: str, torrent_id: str, bundle: RDBundle | TorrentBundle
+    ) -> bool:
+        result = await self.rdbc.select_files(torrent_id, bundle.file_ids)
+        if result.error is not None:
+            logger.warning(
+                "Unable to start torrent",
+                hash=hash,
+                error=result.error,
+                code=result.error_code,
+            )
+            await self.rdbc.delete_magnet(torrent_id)
+            return False
+        return True
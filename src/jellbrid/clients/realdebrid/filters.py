@@ -1,26 +1,39 @@
-def episode_filter(name: str, season_id: int, episode_id: int):
-    """This function can be used to filter RD bundles for cached torrents"""
+import functools
 
-    name = name.lower()
-    if f"s{season_id}e{episode_id}" in name:
-        return True
-    if f"s{season_id}.e{episode_id}" in name:
-        return True
 
+@functools.lru_cache(maxsize=256)
+def _episode_names(season_id: int, episode_id: int) -> tuple[str, ...]:
     season_ = f"{season_id}".zfill(2)
     episode_ = f"{episode_id}".zfill(2)
-    if f"s{season_}e{episode_}" in name:
-        return True
-    if f"s{season_}.e{episode_}" in name:
-        return True
-    return False
+    return (
+        f"s{season_id}e{episode_id}",
+        f"s{season_id}.e{episode_id}",
+        f"s{season_}e{episode_}",
+        f"s{season_}.e{episode_}",
+    )
 
 
-def movie_name_filter(filename: str, name: str) -> bool:
-    for word in name.lower().split():
+@functools.lru_cache(maxsize=256)
+def _title_words(title: str) -> tuple[str, ...]:
+    words = []
+    for word in title.lower().split():
         word = word.strip(":")
         word = word.removesuffix("'s")
-        if word not in filename.lower():
+        words.append(word)
+    return tuple(words)
+
+
+def episode_filter(name: str, season_id: int, episode_id: int):
+    """This function can be used to filter RD bundles for cached torrents"""
+
+    name = name.lower()
+    return any(n in name for n in _episode_names(season_id, episode_id))
+
+
+def movie_name_filter(filename: str, name: str) -> bool:
+    filename = filename.lower()
+    for word in _title_words(name):
+        if word not in filename:
             return False
 
     return True
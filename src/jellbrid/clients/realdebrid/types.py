@@ -1,24 +1,56 @@
 import enum
 import typing as t
 
+import msgspec
+
 RDBundleFileFilter = t.Callable[[str], bool]
-InstantAvailablityType = dict[str, dict[str, list[dict[str, dict]]]]
 
 
-class CachedTorrent(t.TypedDict):
+class CachedTorrent(msgspec.Struct, frozen=True):
     filename: str
     filesize: int
 
 
-class MagnetAddedResponse(t.TypedDict):
-    uri: str
-    id: str
+class HashAvailability(msgspec.Struct, frozen=True):
+    rd: list[dict[str, CachedTorrent]] = []
+
+
+# RD responds with an empty list for hashes that aren't available
+InstantAvailablityType = dict[str, HashAvailability | list]
+
+
+class MagnetAddedResponse(msgspec.Struct, frozen=True):
+    uri: str | None = None
+    id: str | None = None
+    error: str | None = None
+    error_code: int | None = None
+
+
+class SelectFilesResponse(msgspec.Struct, frozen=True):
+    error: str | None = None
+    error_code: int | None = None
+
+
+class TorrentStatus(enum.IntEnum):
+    WAITING_FILES_SELECTION = 1
+    DOWNLOADING = 2
+    DOWNLOADED = 3
+    ERROR = 4
+    DEAD = 5
+    VIRUS = 6
+
+    @classmethod
+    def from_rd(cls, status: str) -> "TorrentStatus | None":
+        """Converts a status string from the RD API, if it's one we track"""
+        return _STATUS_FROM_RD.get(status.lower())
+
 
+_STATUS_FROM_RD: dict[str, TorrentStatus] = {s.name.lower(): s for s in TorrentStatus}
 
-class TorrentStatus(enum.Enum):
-    WAITING_FILES_SELECTION = "waiting_files_selection"
-    DOWNLOADING = "downloading"
-    DOWNLOADED = "DOWNLOADED"
-    ERROR = "ERROR"
-    DEAD = "DEAD"
-    VIRUS = "VIRUS"
+FAILED_STATUSES = frozenset(
+    {
+        TorrentStatus.ERROR,
+        TorrentStatus.DEAD,
+        TorrentStatus.VIRUS,
+    }
+)
@@ -1,5 +1,6 @@
 import datetime
 import enum
+import functools
 import re
 
 from async_lru import alru_cache
@@ -9,6 +10,17 @@ from jellbrid.clients.torrentio.types import Stream
 from jellbrid.config import Config
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_season_pattern(season: int) -> re.Pattern:
+    season_ = f"{season}".zfill(2)
+    patterns = [
+        rf".S{season_}\.",  # abc.S01.xyz
+        rf"\[S{season_}\]",  # [S01]
+        rf"\sS{season_}\s",  # abc S01 abc
+    ]
+    return re.compile("|".join(patterns), re.IGNORECASE)
+
+
 class SortOrder(enum.Enum):
     QUALITY_THEN_SIZE = "qualitysize"
     QUALITY_THEN_SEEDERS = ""
@@ -68,13 +80,4 @@ class TorrentioClient:
 
     @staticmethod
     def contains_full_season_filter(s: Stream, season: int) -> bool:
-        season_ = f"{season}".zfill(2)
-
-        for pattern in [
-            rf".S{season_}\.",  # abc.S01.xyz
-            rf"\[S{season_}\]",  # [S01]
-            rf"\sS{season_}\s",  # abc S01 abc
-        ]:
-            if re.search(pattern, s["title"], re.IGNORECASE):
-                return True
-        return False
+        return _compile_season_pattern(season).search(s["title"]) is not None
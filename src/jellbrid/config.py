@@ -20,7 +20,10 @@ class Config:
             "JELLBRID_LOG_LEVEL", default=logging.DEBUG
         )
         self.dev_mode: bool = env.bool("DEV_MODE", default=True)
+        self.dev_short_circuit: bool = env.bool("DEV_SHORT_CIRCUIT", default=False)
         self.n_parallel_requests: int = env.int("N_PARALLEL_REQUESTS", default=1)
+        # 0 would create a semaphore no probe can ever acquire
+        self.n_parallel_probes: int = max(1, env.int("N_PARALLEL_PROBES", default=4))
         self.storage_dir = Path.home() / ".config/jellbrid"
         Path.mkdir(self.storage_dir, exist_ok=True)
         self.db = self.storage_dir / "jellbrid.db"
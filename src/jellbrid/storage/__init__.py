@@ -2,7 +2,7 @@ from .active_dl_repo import ActiveDownloadRepo
 from .active_dls import ActiveDownload
 from .bad_hashes import BadHash
 from .hash_repo import BadHashRepo
-from .main import create_db, get_session, get_session_maker
+from .main import create_db, get_session_maker
 
 __all__ = (
     "ActiveDownload",
@@ -11,5 +11,4 @@ __all__ = (
     "create_db",
     "ActiveDownloadRepo",
     "get_session_maker",
-    "get_session",
 )
@@ -1,66 +1,86 @@
-from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import typing as t
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from jellbrid.config import Config
 from jellbrid.storage.active_dls import ActiveDownload
 
 
 class ActiveDownloadRepo:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
         self.cfg = Config()
-        self.session = session
+        self._sessionmaker = sessionmaker
 
     async def add(self, download: ActiveDownload):
         if self.cfg.dev_mode:
             return
-        async with self.session.begin():
-            self.session.add(download)
+        async with self._sessionmaker() as session, session.begin():
+            session.add(download)
 
     async def delete(self, download: ActiveDownload):
-        async with self.session.begin():
-            await self.session.delete(download)
+        async with self._sessionmaker() as session, session.begin():
+            await session.delete(await session.merge(download))
+
+    async def has_movie(self, imdb_id: str) -> bool:
+        query = select(
+            exists().where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
+        )
+        async with self._sessionmaker() as session:
+            return bool(await session.scalar(query))
 
-    async def has_movie(self, imdb_id: str):
-        async with self.session.begin():
-            query = select(ActiveDownload).where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
-            results = await self.session.execute(query)
-        return results.fetchone() is not None
+    async def has_season(self, imdb_id: str, season: int) -> bool:
+        query = select(
+            exists()
+            .where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
+            .where(ActiveDownload.season == season)  # type: ignore
+        )
+        async with self._sessionmaker() as session:
+            return bool(await session.scalar(query))
 
-    async def has_season(self, imdb_id: str, season: int):
-        async with self.session.begin():
-            query = (
-                select(ActiveDownload)
-                .where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
-                .where(ActiveDownload.season == season)  # type: ignore
-            )
-            results = await self.session.execute(query)
-        return results.fetchone() is not None
+    async def has_episode(self, imdb_id: str, season: int, episode: int) -> bool:
+        query = select(
+            exists()
+            .where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
+            .where(ActiveDownload.season == season)  # type: ignore
+            .where(ActiveDownload.episode == episode)  # type: ignore
+        )
+        async with self._sessionmaker() as session:
+            return bool(await session.scalar(query))
 
-    async def has_episode(self, imdb_id: str, season: int, episode: int):
-        async with self.session.begin():
-            query = (
-                select(ActiveDownload)
-                .where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
-                .where(ActiveDownload.season == season)  # type: ignore
-                .where(ActiveDownload.episode == episode)  # type: ignore
-            )
-            results = await self.session.execute(query)
-        return results.fetchone() is not None
+    async def get_active_set(
+        self, imdb_id: str
+    ) -> frozenset[tuple[int | None, int | None]]:
+        """
+        Returns the (season, episode) pairs currently downloading for a piece of
+        media so that many episodes can be checked with a single query
+        """
+        query = (
+            select(ActiveDownload.season, ActiveDownload.episode)  # type: ignore
+            .where(ActiveDownload.imdb_id == imdb_id)  # type: ignore
+        )
+        async with self._sessionmaker() as session:
+            results = await session.execute(query)
+            return frozenset((season, episode) for season, episode in results)
 
-    async def get_requests(self):
-        async with self.session.begin():
-            query = select(ActiveDownload)
-            results = await self.session.scalars(query)
-        return results.all()
+    async def get_requests(self) -> t.Sequence[ActiveDownload]:
+        """
+        Returns every active download. The rows are loaded up front so callers
+        never hold a session open while they make RD requests
+        """
+        query = select(ActiveDownload)
+        async with self._sessionmaker() as session:
+            results = await session.scalars(query)
+            return results.all()
 
     async def get_by_did(self, did: str) -> ActiveDownload | None:
-        async with self.session.begin():
-            query = (
-                select(ActiveDownload).where(ActiveDownload.torrent_id == did)  # type: ignore
-            )
-            return await self.session.scalar(query)
+        query = (
+            select(ActiveDownload).where(ActiveDownload.torrent_id == did)  # type: ignore
+        )
+        async with self._sessionmaker() as session:
+            return await session.scalar(query)
 
     async def delete_by_did(self, did: str) -> None:
-        async with self.session.begin():
-            query = delete(ActiveDownload).where(ActiveDownload.torrent_id == did)  # type: ignore
-            await self.session.execute(query)
+        query = delete(ActiveDownload).where(ActiveDownload.torrent_id == did)  # type: ignore
+        async with self._sessionmaker() as session, session.begin():
+            await session.execute(query)
@@ -0,0 +1,33 @@
+"""Added active downloads lookup index
+
+Revision ID: 3c9e1f7a2b64
+Revises: 8421aaad5a05
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e1f7a2b64"
+down_revision: Union[str, None] = "8421aaad5a05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_active_downloads_imdb_id_season_episode",
+        "active_downloads",
+        ["imdb_id", "season", "episode"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_active_downloads_imdb_id_season_episode", table_name="active_downloads"
+    )
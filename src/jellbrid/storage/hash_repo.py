@@ -1,23 +1,22 @@
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from jellbrid.config import Config
 from jellbrid.storage.bad_hashes import BadHash
 
 
 class BadHashRepo:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
         self.cfg = Config()
-        self.session = session
+        self._sessionmaker = sessionmaker
 
     async def add(self, hash: BadHash):
         if self.cfg.dev_mode:
             return
-        async with self.session.begin():
-            self.session.add(hash)
+        async with self._sessionmaker() as session, session.begin():
+            session.add(hash)
 
-    async def has(self, hash: str):
-        async with self.session.begin():
-            query = select(BadHash).where(BadHash.hash == hash)  # type: ignore
-            results = await self.session.execute(query)
-        return results.fetchone() is not None
+    async def has(self, hash: str) -> bool:
+        query = select(exists().where(BadHash.hash == hash))  # type: ignore
+        async with self._sessionmaker() as session:
+            return bool(await session.scalar(query))
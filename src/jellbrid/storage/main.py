@@ -4,7 +4,17 @@ import anyio
 import anyio.to_thread
 from alembic import command
 from alembic.config import Config as AlembicConfig
-from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    event,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -35,17 +45,24 @@ def get_session_maker() -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
-def get_session():
-    return get_session_maker()()
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # most pragmas are per-connection, so they need to run for every connection
+    # the pool opens rather than once at startup
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute("PRAGMA busy_timeout = 5000")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA cache_size = -65536")
+    cursor.close()
 
 
 async def create_db(cfg: Config):
     global engine
     engine = create_async_engine(f"sqlite+aiosqlite:///{cfg.db}")
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
     async with engine.begin() as conn:
         await conn.run_sync(mapper_registry.metadata.create_all)
-        await conn.exec_driver_sql("PRAGMA journal_mode = WAL")
-        await conn.exec_driver_sql("PRAGMA busy_timeout = 5000")
         await run_migrations()
 
     start_mappers()
@@ -73,6 +90,9 @@ active_downloads = Table(
     Column("created_at", DateTime(timezone=True), nullable=False),
     Column("season", Integer, nullable=True),
     Column("episode", Integer, nullable=True),
+    Index(
+        "ix_active_downloads_imdb_id_season_episode", "imdb_id", "season", "episode"
+    ),
 )
 
 bad_hashes = Table(
@@ -8,6 +8,7 @@ from zoneinfo import ZoneInfo
 
 from jellbrid.clients.jellyfin import JellyfinClient, scan_and_wait_for_completion
 from jellbrid.clients.realdebrid import (
+    FAILED_STATUSES,
     RealDebridClient,
     RealDebridDownloader,
     TorrentStatus,
@@ -63,7 +64,7 @@ async def handle_movie_request(
         streams = await filter_streams_with_bad_hashes(hash_repo, streams)
         rdd = RealDebridDownloader(rdbc, request=request, streams=streams)
 
-        downloaded = await rdd.download_movie()
+        downloaded = await rdd.download()
         if downloaded is not None:
             ad = ActiveDownload.from_movie_request(request, downloaded)
             await dl_repo.add(ad)
@@ -97,7 +98,7 @@ async def handle_season_request(
         streams = await get_streams_for_show(tc, request)
         streams = await filter_streams_with_bad_hashes(hash_repo, streams)
         rdd = RealDebridDownloader(rdbc, request=request, streams=streams)
-        downloaded = await rdd.download_show()
+        downloaded = await rdd.download()
         if downloaded is not None:
             ad = ActiveDownload.from_season_request(request, downloaded)
             await dl_repo.add(ad)
@@ -108,10 +109,18 @@ async def handle_season_request(
 
     if backoff_to_episodes:
         logger.info("Searching for individual episodes")
+        active = await dl_repo.get_active_set(request.imdb_id)
         for er in request.to_episode_requests():
             with structlog.contextvars.bound_contextvars(**er.ctx):
                 await handle_episode_request(
-                    er, tc, rdbc, sync, dl_repo=dl_repo, hash_repo=hash_repo, rc=rc
+                    er,
+                    tc,
+                    rdbc,
+                    sync,
+                    dl_repo=dl_repo,
+                    hash_repo=hash_repo,
+                    rc=rc,
+                    active=active,
                 )
 
 
@@ -123,10 +132,15 @@ async def handle_episode_request(
     dl_repo: ActiveDownloadRepo,
     hash_repo: BadHashRepo,
     rc: RequestCache,
+    active: frozenset[tuple[int | None, int | None]] | None = None,
 ):
-    if await dl_repo.has_episode(
-        request.imdb_id, request.season_id, request.episode_id
-    ):
+    if active is not None:
+        downloading = (request.season_id, request.episode_id) in active
+    else:
+        downloading = await dl_repo.has_episode(
+            request.imdb_id, request.season_id, request.episode_id
+        )
+    if downloading:
         logger.debug("Ignoring currently downloading episode")
         return
 
@@ -140,14 +154,7 @@ async def handle_episode_request(
         streams = await get_streams_for_show(tc, request)
         streams = await filter_streams_with_bad_hashes(hash_repo, streams)
         rdd = RealDebridDownloader(rdbc, request=request, streams=streams)
-
-        # search for a cached file with just the episode we want
-        downloaded = await rdd.download_episode()
-
-        if downloaded is None:
-            # search for the episode we want inside of a cached file
-            downloaded = await rdd.download_episode_from_bundle()
-
+        downloaded = await rdd.download()
         if downloaded is not None:
             ad = ActiveDownload.from_episode_request(request, downloaded)
             await dl_repo.add(ad)
@@ -167,10 +174,11 @@ async def update_active_downloads(
     async with sync.processing_lock:
         for request in await repo.get_requests():
             info = await rdbc.get_torrent_files_info(request.torrent_id)
+            status = TorrentStatus.from_rd(info["status"])
             if info["progress"] == 100:
                 sync.refresh.set()
                 await repo.delete(request)
-            elif info["status"] in ("error", "dead"):
+            elif status in FAILED_STATUSES:
                 logger.warning("Unable to process download")
                 await repo.delete(request)
 